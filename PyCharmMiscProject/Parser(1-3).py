@@ -13,15 +13,88 @@ Key parsing rule added:
       Otherwise, any additional numbers are treated as spin-off spins (unless BONUS).
 """
 
+import functools
 import json
 import re
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# Optional: orjson serializes large outputs ~5-10x faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ijson streams the input instead of materializing it all at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 INPUT_PATH = "tpir_episodes_combined.json"
 
+
+def iter_episodes(path: str):
+    """Yield episodes one at a time, streaming via ijson when available."""
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def dump_json(obj, path: str) -> None:
+    """Write compact JSON, via orjson's C serializer when available.
+
+    These outputs are machine-consumed downstream, so skip indent=2 —
+    pretty-printing roughly doubles the bytes and triples the time.
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+
+# -----------------------------
+# Record types
+# -----------------------------
+# Slotted dataclasses instead of nested dicts: attribute access is cheaper
+# than key hashing in the winner/classification loops and each record is
+# several times smaller. Serialized via dataclasses.asdict at output time.
+
+@dataclass(slots=True)
+class Spin:
+    spin_index: int
+    value: Optional[float]
+
+
+@dataclass(slots=True)
+class ExtraSpin:
+    value: float
+
+
+@dataclass(slots=True)
+class Contestant:
+    name: str
+    pre_wheel_winnings: Optional[int]
+    initial_spins: List[Spin]
+    total: float
+    bust: bool
+    spin_off_spins: List[ExtraSpin] = field(default_factory=list)
+    bonus_spins: List[ExtraSpin] = field(default_factory=list)
+    advanced_to_showcase: bool = False
+
+
 # -----------------------------
 # Numeric parsing helpers
 # -----------------------------
 
+@functools.lru_cache(maxsize=8192)
 def num_from_token(tok: str):
     """Convert tokens like '35', '35+', '1.00', '3,413+' into floats."""
     clean = tok.strip().strip("=,>+")
@@ -40,9 +113,9 @@ def num_from_token(tok: str):
     return val
 
 
-def is_money_token(tokens, i):
-    """Identify pre-wheel money based on formatting heuristics."""
-    tok = tokens[i]
+@functools.lru_cache(maxsize=8192)
+def _money_token_val(tok: str) -> bool:
+    """Position-independent part of the money heuristic, memoized per token."""
     if tok == "$":
         return False
 
@@ -52,10 +125,6 @@ def is_money_token(tokens, i):
     except:
         return False
 
-    # If previous is $, then this token is the numeric part of money
-    if i > 0 and tokens[i - 1] == "$":
-        return False
-
     if "," in clean or "." in clean:
         return True
     if val > 200:
@@ -63,7 +132,15 @@ def is_money_token(tokens, i):
     return False
 
 
-def find_contestant_starts(tokens):
+def is_money_token(tokens, i):
+    """Identify pre-wheel money based on formatting heuristics."""
+    # If previous is $, then this token is the numeric part of money
+    if i > 0 and tokens[i - 1] == "$":
+        return False
+    return _money_token_val(tokens[i])
+
+
+def find_contestant_starts(tokens, parsed_nums):
     """Locate all contestant starting indices (where money value appears)."""
     starts = []
     n = len(tokens)
@@ -72,7 +149,7 @@ def find_contestant_starts(tokens):
         tok = tokens[i]
 
         if tok == "$":
-            if i + 1 < n and num_from_token(tokens[i + 1]) is not None:
+            if i + 1 < n and parsed_nums[i + 1] is not None:
                 starts.append(i)
                 i += 2
                 continue
@@ -88,7 +165,7 @@ def find_contestant_starts(tokens):
 # Parsing a single contestant
 # -----------------------------
 
-def parse_contestant(tokens, start_idx, end_idx):
+def parse_contestant(tokens, start_idx, end_idx, parsed_nums):
     """
     Parse one contestant’s spins, bust, extras, totals, etc.
 
@@ -104,8 +181,7 @@ def parse_contestant(tokens, start_idx, end_idx):
     else:
         money_idx = start_idx
 
-    money_raw = tokens[money_idx]
-    money_val = num_from_token(money_raw)
+    money_val = parsed_nums[money_idx]
     if money_val is not None:
         try:
             money_val = int(round(money_val))
@@ -115,22 +191,23 @@ def parse_contestant(tokens, start_idx, end_idx):
     # Name + action tokens
     if money_idx + 1 >= end_idx:
         name = "UNKNOWN"
-        action_tokens = []
+        action_start = end_idx
     else:
         name = tokens[money_idx + 1].strip(",.")
-        action_tokens = tokens[money_idx + 2:end_idx]
+        action_start = money_idx + 2
 
-    # Flags
-    text_lower = " ".join(action_tokens).lower()
-    has_bonus_kw = "bonus" in text_lower
-
-    # Detect explicit second-spin marker
-    plus_present = any(t == "+" for t in action_tokens)
-
-    # Extract numeric values (preserving order)
+    # One pass over the action tokens: bonus keyword, explicit second-spin
+    # marker, and numeric values (preserving order, reusing parsed_nums)
+    has_bonus_kw = False
+    plus_present = False
     numeric_vals = []
-    for t in action_tokens:
-        v = num_from_token(t)
+    for k in range(action_start, end_idx):
+        t = tokens[k]
+        if t == "+":
+            plus_present = True
+        elif not has_bonus_kw and ("b" in t or "B" in t) and "bonus" in t.lower():
+            has_bonus_kw = True
+        v = parsed_nums[k]
         if v is not None:
             numeric_vals.append(v)
 
@@ -168,23 +245,22 @@ def parse_contestant(tokens, start_idx, end_idx):
     bonus_spins = []
     if extras:
         if has_bonus_kw:
-            bonus_spins = [{"value": float(v)} for v in extras]
+            bonus_spins = [ExtraSpin(value=float(v)) for v in extras]
         else:
-            spin_off_spins = [{"value": float(v)} for v in extras]
-
-    return {
-        "name": name,
-        "pre_wheel_winnings": money_val,
-        "initial_spins": [
-            {"spin_index": 1, "value": float(first) if first is not None else None},
-            {"spin_index": 2, "value": float(second) if second is not None else None},
+            spin_off_spins = [ExtraSpin(value=float(v)) for v in extras]
+
+    return Contestant(
+        name=name,
+        pre_wheel_winnings=money_val,
+        initial_spins=[
+            Spin(spin_index=1, value=float(first) if first is not None else None),
+            Spin(spin_index=2, value=float(second) if second is not None else None),
         ],
-        "total": float(total),
-        "bust": bust,
-        "spin_off_spins": spin_off_spins,
-        "bonus_spins": bonus_spins,
-        "advanced_to_showcase": False,
-    }
+        total=float(total),
+        bust=bust,
+        spin_off_spins=spin_off_spins,
+        bonus_spins=bonus_spins,
+    )
 
 
 # -----------------------------
@@ -199,8 +275,8 @@ def resolve_winner(contestants):
     # initial total (ignore spin-off/bonus)
     init_totals = []
     for c in contestants:
-        a = c["initial_spins"][0]["value"]
-        b = c["initial_spins"][1]["value"]
+        a = c.initial_spins[0].value
+        b = c.initial_spins[1].value
         init_total = (a or 0) + (b or 0)
         init_totals.append(init_total)
 
@@ -208,7 +284,7 @@ def resolve_winner(contestants):
     best = -1
     best_idxs = []
     for i, c in enumerate(contestants):
-        if c["bust"]:
+        if c.bust:
             continue
         t = init_totals[i]
         if t > best:
@@ -223,27 +299,24 @@ def resolve_winner(contestants):
     if len(best_idxs) == 1:
         return best_idxs[0]
 
-    # tie-break via spin-off spins
-    k = 0
-    while True:
-        spins = []
-        for i in best_idxs:
-            so = contestants[i]["spin_off_spins"]
-            spins.append(so[k]["value"] if k < len(so) else None)
-
-        # if no one has a spin at this depth, unresolved
-        if all(v is None for v in spins):
-            return None
-
-        # compare available spins
-        maxv = max(v for v in spins if v is not None)
-        new_best = [best_idxs[j] for j, v in enumerate(spins) if v == maxv]
-
-        if len(new_best) == 1:
-            return new_best[0]
-
-        best_idxs = new_best
-        k += 1
+    # tie-break via spin-off spins: lexicographic argmax over a matrix of
+    # the contenders' spin-off values, padded with -inf for missing spins
+    maxk = max(len(contestants[i].spin_off_spins) for i in best_idxs)
+    so_matrix = np.full((len(best_idxs), maxk), -np.inf)
+    for row, i in enumerate(best_idxs):
+        for k, s in enumerate(contestants[i].spin_off_spins):
+            so_matrix[row, k] = s.value
+
+    tied = np.arange(len(best_idxs))
+    for k in range(maxk):
+        col = so_matrix[tied, k]
+        best = col.max()
+        if best == -np.inf:
+            return None  # no one has a spin at this depth, unresolved
+        tied = tied[col == best]
+        if len(tied) == 1:
+            return best_idxs[int(tied[0])]
+    return None
 
 
 # -----------------------------
@@ -252,7 +325,10 @@ def resolve_winner(contestants):
 
 def parse_showdown(text: str):
     tokens = text.split()
-    starts = find_contestant_starts(tokens)
+    # Parse every token's numeric value once; all helpers consult this
+    # instead of re-parsing the same tokens
+    parsed_nums = list(map(num_from_token, tokens))
+    starts = find_contestant_starts(tokens, parsed_nums)
 
     contestants = []
     has_bonus = False
@@ -260,16 +336,16 @@ def parse_showdown(text: str):
 
     for idx, start in enumerate(starts):
         end = starts[idx + 1] if idx + 1 < len(starts) else len(tokens)
-        c = parse_contestant(tokens, start, end)
+        c = parse_contestant(tokens, start, end, parsed_nums)
         contestants.append(c)
-        if c["bonus_spins"]:
+        if c.bonus_spins:
             has_bonus = True
-        if c["spin_off_spins"]:
+        if c.spin_off_spins:
             has_spinoff = True
 
     winner_index = resolve_winner(contestants)
     if winner_index is not None:
-        contestants[winner_index]["advanced_to_showcase"] = True
+        contestants[winner_index].advanced_to_showcase = True
 
     return {
         "raw_text": text,
@@ -297,10 +373,10 @@ def classify_scenario(showdown):
 
     # All must have first spin
     for c in contestants:
-        if c["initial_spins"][0]["value"] is None:
+        if c.initial_spins[0].value is None:
             return None
 
-    busts = sum(c["bust"] for c in contestants)
+    busts = sum(c.bust for c in contestants)
 
     # Scenario 3: has a spin-off, no bonus
     if showdown["has_spinoff"]:
@@ -319,41 +395,45 @@ def classify_scenario(showdown):
 # -----------------------------
 
 def main():
-    with open(INPUT_PATH, "r", encoding="utf-8") as f:
-        episodes = json.load(f)
+    # Only the showdown texts are needed, so stream the episodes and drop
+    # each one as soon as its texts are collected.
+    texts = [
+        sd.get("text", "")
+        for ep in iter_episodes(INPUT_PATH)
+        for sd in ep.get("showcase_showdowns", [])
+    ]
+
+    # Each showdown parses independently, so spread the CPU-bound work
+    # across cores; classification and output stay on the main process.
+    with ProcessPoolExecutor() as ex:
+        parsed_showdowns = list(ex.map(parse_showdown, texts, chunksize=128))
 
     structured_showdowns = []
     scenario_1_list = []
     scenario_2_list = []
     scenario_3_list = []
 
-    for ep in episodes:
-        for sd in ep.get("showcase_showdowns", []):
-            parsed = parse_showdown(sd.get("text", ""))
-
-            sc = classify_scenario(parsed)
-            parsed["scenario"] = sc
-
-            structured_showdowns.append(parsed)
-
-            if sc == 1:
-                scenario_1_list.append(parsed)
-            elif sc == 2:
-                scenario_2_list.append(parsed)
-            elif sc == 3:
-                scenario_3_list.append(parsed)
+    for parsed in parsed_showdowns:
+        sc = classify_scenario(parsed)
+        parsed["scenario"] = sc
 
-    with open("structured_showdowns.json", "w", encoding="utf-8") as f:
-        json.dump(structured_showdowns, f, indent=2)
+        # Contestants stay dataclasses in memory; convert at the
+        # serialization boundary only
+        parsed["contestants"] = [asdict(c) for c in parsed["contestants"]]
 
-    with open("scenario_1_showdowns.json", "w", encoding="utf-8") as f:
-        json.dump(scenario_1_list, f, indent=2)
+        structured_showdowns.append(parsed)
 
-    with open("scenario_2_showdowns.json", "w", encoding="utf-8") as f:
-        json.dump(scenario_2_list, f, indent=2)
+        if sc == 1:
+            scenario_1_list.append(parsed)
+        elif sc == 2:
+            scenario_2_list.append(parsed)
+        elif sc == 3:
+            scenario_3_list.append(parsed)
 
-    with open("scenario_3_showdowns.json", "w", encoding="utf-8") as f:
-        json.dump(scenario_3_list, f, indent=2)
+    dump_json(structured_showdowns, "structured_showdowns.json")
+    dump_json(scenario_1_list, "scenario_1_showdowns.json")
+    dump_json(scenario_2_list, "scenario_2_showdowns.json")
+    dump_json(scenario_3_list, "scenario_3_showdowns.json")
 
     print("Total parsed:", len(structured_showdowns))
     print("Scenario 1:", len(scenario_1_list))
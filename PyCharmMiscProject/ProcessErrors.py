@@ -7,7 +7,6 @@ Compact analysis of the parsing/validation error file produced by Process.py.
 """
 
 import json
-from collections import Counter, defaultdict
 
 # MODIFY THIS IF YOUR PATH DIFFERS
 INPUT_PATH = r"C:\Users\eggep\PyCharmMiscProject\tpir_showdown_parse_errors.json"
@@ -23,9 +22,9 @@ def main():
     print(f"\n=== ERROR DATASET SUMMARY ===")
     print(f"Total error showdowns: {len(errors)}\n")
 
-    # Containers for counting and grouping
-    type_counter = Counter()
-    grouped_examples = defaultdict(list)
+    # One dict keyed by error type holding [count, examples], so each
+    # record costs a single lookup instead of Counter + defaultdict ops
+    stats = {}
 
     for e in errors:
         parse_warnings = e.get("parse_warnings", []) or []
@@ -36,22 +35,26 @@ def main():
             combined_errors = ["unknown_error"]
 
         for err in combined_errors:
-            type_counter[err] += 1
-            if len(grouped_examples[err]) < MAX_EXAMPLES_PER_ERROR_TYPE:
-                grouped_examples[err].append(e)
+            entry = stats.get(err)
+            if entry is None:
+                stats[err] = [1, [e]]
+            else:
+                entry[0] += 1
+                if len(entry[1]) < MAX_EXAMPLES_PER_ERROR_TYPE:
+                    entry[1].append(e)
 
     # --------------------------------------------------
     # ERROR FREQUENCY REPORT
     # --------------------------------------------------
     print("=== ERROR TYPE FREQUENCY ===")
-    for err, ct in type_counter.most_common():
+    for err, (ct, _) in sorted(stats.items(), key=lambda kv: -kv[1][0]):
         print(f"{err}: {ct}")
 
     # --------------------------------------------------
     # EXAMPLES
     # --------------------------------------------------
     print("\n=== HUMAN-READABLE ERROR EXAMPLES ===")
-    for err, examples in grouped_examples.items():
+    for err, (_, examples) in stats.items():
         print(f"\n--- ERROR TYPE: {err} ---")
         for ex in examples:
             print(f"\nEpisode: {ex.get('episode_title')}   Date: {ex.get('iso_date')}")
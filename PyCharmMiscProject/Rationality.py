@@ -17,11 +17,14 @@ def qre_probability(delta, lam):
     """Probability of choosing the equilibrium action"""
     return 1 / (1 + np.exp(-lam * delta))
 
+# Compute all curves in one broadcast: (4,1) deltas x (1,200) lambdas
+deltas = np.array(list(deltas_C2.values()))[:, None]
+probs_all = qre_probability(deltas, lambdas[None, :])
+
 # Plot
 plt.figure(figsize=(10, 6))
 
-for label, delta in deltas_C2.items():
-    probs = qre_probability(delta, lambdas)
+for label, probs in zip(deltas_C2, probs_all):
     plt.plot(lambdas, probs * 100, label=label)
 
 plt.xscale("log")
@@ -1,74 +1,180 @@
+import asyncio
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+import soupsieve as sv
 import re
+import io
 import json
-from datetime import datetime
 import time
 
+# Optional: aiohttp lets the crawler download the next page while the
+# current one is still being parsed; without it we fall back to the
+# sequential pooled-session crawl.
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Optional: orjson serializes episode records ~10x faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_line(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj) + b"\n"
+    return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
 START_URL = "https://tpirepguide.com/?p=9773"
 MAX_PAGES = 20000
 REQUEST_DELAY = 0.1
 
+# One pooled session for the whole crawl: every page lives on the same
+# host, so keep-alive connections skip the TCP+TLS handshake per request.
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "Mozilla/5.0"})
+SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=8,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    ),
+)
+
+# Only these page regions are ever queried, so the parser can skip
+# building the rest of the tree (comments, sidebars, scripts). The
+# <title> tag and rel="next" anchors live outside these divs and back
+# the episode-title / next-page fallbacks, so they are admitted too.
+class _PageStrainer(SoupStrainer):
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        if name == "title":
+            return True
+        if name == "a":
+            rel = (attrs or {}).get("rel") or ""
+            if isinstance(rel, str):
+                rel = rel.split()
+            return "next" in rel
+        return super().allow_tag_creation(nsprefix, name, attrs)
+
+
+_PAGE_STRAINER = _PageStrainer("div", class_=[
+    "post-bodycopy",
+    "post",
+    "post-footer",
+    "post-headline",
+    "post-pagination",
+    "navigation-top",
+])
+
+# CSS selectors compiled once via soupsieve; select_one with a string
+# literal re-tokenizes the selector on every call.
+_SEL_TITLE = sv.compile("div.post-headline h1")
+_SEL_FOOTER = sv.compile("div.post-footer")
+_SEL_FOOTER_LINKS = sv.compile("a")
+_SEL_POST_BODY = sv.compile("div.post-bodycopy")
+_SEL_POST = sv.compile("div.post")
+_SEL_PAGINATION = sv.compile("div.post-pagination a.page-numbers")
+_SEL_NEWER = sv.compile("div.navigation-top div.newer a")
+
+# Patterns used inside the per-line loops, compiled once; re's internal
+# cache still costs a dict lookup per call on string-literal patterns.
+_ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+_WS_RE = re.compile(r"\s+")
+_SHOWCASE_NUM_RE = re.compile(r"^showcase\s*#\d+\b")
+_SCORE_START_RE = re.compile(r"^\$?\s*[\d,]")
+_NUM_RE = re.compile(r"[-+]?\d+(\.\d+)?")
+_THROUGH_RE = re.compile(r"through to the showcases?", re.I)
+_BONUS_RE = re.compile(r"(bonus spin|spin[- ]off|busted|dollar)", re.I)
+_STARS_RE = re.compile(r"^\* \* \*$")
+
 # -----------------------------------------------------------
 # DATE PARSER
 # -----------------------------------------------------------
+_MONTHS = {
+    "january": 1, "february": 2, "march": 3, "april": 4,
+    "may": 5, "june": 6, "july": 7, "august": 8,
+    "september": 9, "october": 10, "november": 11, "december": 12,
+}
+
+
 def clean_and_parse_date(date_text: str):
+    """Parse "{MonthName} {D}{st/nd/rd/th}, {YYYY}" by hand; strptime
+    recompiles its format string (with locale machinery) on every call."""
     raw = date_text.strip()
-    cleaned = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', raw)
+    cleaned = _ORDINAL_RE.sub(r'\1', raw)
     iso_date = None
-    try:
-        dt = datetime.strptime(cleaned, "%B %d, %Y")
-        iso_date = dt.date().isoformat()
-    except ValueError:
-        pass
+    parts = cleaned.split()
+    if len(parts) == 3:
+        month = _MONTHS.get(parts[0].lower())
+        try:
+            day = int(parts[1].rstrip(','))
+            year = int(parts[2])
+        except ValueError:
+            month = None
+        if month and 1 <= day <= 31:
+            iso_date = f"{year:04d}-{month:02d}-{day:02d}"
     return raw, iso_date
 
 # -----------------------------------------------------------
 # FOOTER EXTRACTOR
 # -----------------------------------------------------------
 def extract_footer_info(soup: BeautifulSoup):
-    footer = soup.select_one("div.post-footer")
+    footer = _SEL_FOOTER.select_one(soup)
     if not footer:
         return None, None, []
 
     footer_text = footer.get_text(" ", strip=True)
     date_part = footer_text.split("|", 1)[0].strip()
     raw_date, iso_date = clean_and_parse_date(date_part)
-    categories = [a.get_text(strip=True) for a in footer.select("a")]
+    categories = [a.get_text(strip=True) for a in _SEL_FOOTER_LINKS.select(footer)]
     return raw_date, iso_date, categories
 
 # -----------------------------------------------------------
 # **UPDATED SHOWCASE SHOWDOWN EXTRACTOR**
 # -----------------------------------------------------------
+def _iter_lines(container):
+    """Yield text lines child-by-child instead of flattening the whole
+    post into one giant string and splitting it back apart."""
+    for node in container.children:
+        if isinstance(node, NavigableString):
+            text = str(node)
+        else:
+            text = node.get_text("\n")
+        yield from text.replace("\u00A0", " ").splitlines()
+
+
 def extract_showcase_showdowns(soup: BeautifulSoup):
     container = (
-        soup.select_one("div.post-bodycopy")
-        or soup.select_one("div.post")
+        _SEL_POST_BODY.select_one(soup)
+        or _SEL_POST.select_one(soup)
         or soup
     )
 
-    text = container.get_text("\n", strip=False)
-    text = text.replace("\u00A0", " ")
-    lines = text.splitlines()
-
     showdowns = []
     current_label = None
-    buffer = []
+    # One reusable text buffer for the whole post: scoreboard lines are
+    # written with inline separators and the buffer is rewound per
+    # showdown, instead of allocating a fresh list each time
+    buf = io.StringIO()
     scoreboard_started = False
 
-    # --- Flush function: normalize whitespace before saving ---
+    # --- Flush function ---
     def flush():
-        nonlocal current_label, buffer, scoreboard_started
-        if current_label and buffer:
-            body = "\n".join(buffer).strip()
+        nonlocal current_label, scoreboard_started
+        if current_label and buf.tell():
+            body = buf.getvalue().rstrip()
             if body:
-                body = re.sub(r"\s+", " ", body).strip()
                 showdowns.append({
                     "label": current_label,
                     "text": body,
                 })
         current_label = None
-        buffer = []
+        buf.seek(0)
+        buf.truncate(0)
         scoreboard_started = False
 
     # --- Header recognition logic ---
@@ -78,26 +184,26 @@ def extract_showcase_showdowns(soup: BeautifulSoup):
         if header_norm.startswith("showdown"):
             return True
         # Handles ep formats like "SHOWCASE #1" (wheel, NOT final Showcases)
-        if re.match(r"^showcase\s*#\d+\b", header_norm):
+        if _SHOWCASE_NUM_RE.match(header_norm):
             return True
         return False
 
     # --- Scoreboard recognizers ---
     def is_scoreboard_start(s: str) -> bool:
-        return bool(re.match(r"^\$?\s*[\d,]", s))
+        return bool(_SCORE_START_RE.match(s))
 
     def is_scoreboard_continuation(s: str) -> bool:
         s_strip = s.strip()
         if not s_strip:
             return False
 
-        if re.fullmatch(r"[-+]?\d+(\.\d+)?", s_strip):
+        if _NUM_RE.fullmatch(s_strip):
             return True
         if s_strip in {"+", "-"}:
             return True
-        if re.match(r"through to the showcases?", s_strip, re.I):
+        if _THROUGH_RE.match(s_strip):
             return True
-        if re.match(r"(bonus spin|spin[- ]off|busted|dollar)", s_strip, re.I):
+        if _BONUS_RE.match(s_strip):
             return True
 
         return False
@@ -105,22 +211,25 @@ def extract_showcase_showdowns(soup: BeautifulSoup):
     # ---------------------------------------------------------
     # MAIN LINE LOOP
     # ---------------------------------------------------------
-    for line in lines:
+    for line in _iter_lines(container):
         stripped = line.strip()
-        header_norm = re.sub(r"\s+", " ", stripped).lower()
 
-        # End of wheel showdowns: hit the "SHOWCASES" section
-        if header_norm.startswith("showcases"):
-            flush()
-            break
+        # Headers all start with s/S, so skip the normalize+lower pass
+        # for the vast majority of lines
+        if stripped[:1] in ("s", "S"):
+            header_norm = _WS_RE.sub(" ", stripped).lower()
+
+            # End of wheel showdowns: hit the "SHOWCASES" section
+            if header_norm.startswith("showcases"):
+                flush()
+                break
 
-        # Start of a new showdown?
-        if is_showdown_header(header_norm):
-            flush()
-            current_label = stripped or "Showcase Showdown"
-            buffer = []
-            scoreboard_started = False
-            continue
+            # Start of a new showdown?
+            if is_showdown_header(header_norm):
+                flush()
+                current_label = stripped
+                scoreboard_started = False
+                continue
 
         # If we are currently inside a showdown:
         if current_label is not None:
@@ -133,13 +242,14 @@ def extract_showcase_showdowns(soup: BeautifulSoup):
                     continue
 
                 # Separator "***"
-                if re.match(r"^\* \* \*$", stripped):
+                if _STARS_RE.match(stripped):
                     flush()
                     continue
 
                 # More scoreboard content?
                 if is_scoreboard_start(stripped) or is_scoreboard_continuation(stripped):
-                    buffer.append(stripped)
+                    buf.write(stripped)
+                    buf.write(" ")
                 else:
                     # First non-scoreboard line terminates this showdown
                     flush()
@@ -150,7 +260,8 @@ def extract_showcase_showdowns(soup: BeautifulSoup):
                     continue
                 if is_scoreboard_start(stripped):
                     scoreboard_started = True
-                    buffer.append(stripped)
+                    buf.write(stripped)
+                    buf.write(" ")
 
     flush()
     return showdowns
@@ -159,7 +270,7 @@ def extract_showcase_showdowns(soup: BeautifulSoup):
 # NEXT-PAGE RESOLUTION
 # -----------------------------------------------------------
 def find_next_url(soup: BeautifulSoup, current_url: str):
-    next_link = soup.select_one("div.post-pagination a.page-numbers")
+    next_link = _SEL_PAGINATION.select_one(soup)
     if next_link and "href" in next_link.attrs:
         return requests.compat.urljoin(current_url, next_link["href"])
 
@@ -167,7 +278,7 @@ def find_next_url(soup: BeautifulSoup, current_url: str):
     if rel_next and "href" in rel_next.attrs:
         return requests.compat.urljoin(current_url, rel_next["href"])
 
-    newer_link = soup.select_one("div.navigation-top div.newer a")
+    newer_link = _SEL_NEWER.select_one(soup)
     if newer_link and "href" in newer_link.attrs:
         return requests.compat.urljoin(current_url, newer_link["href"])
 
@@ -176,13 +287,8 @@ def find_next_url(soup: BeautifulSoup, current_url: str):
 # -----------------------------------------------------------
 # SCRAPE A SINGLE EPISODE
 # -----------------------------------------------------------
-def scrape_episode(url: str):
-    print(f"\nFetching: {url}")
-    resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-    resp.raise_for_status()
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    title_tag = soup.select_one("div.post-headline h1") or soup.find("title")
+def parse_episode_soup(soup: BeautifulSoup, url: str):
+    title_tag = _SEL_TITLE.select_one(soup) or soup.find("title")
     episode_title = title_tag.get_text(strip=True) if title_tag else None
 
     raw_date, iso_date, categories = extract_footer_info(soup)
@@ -202,11 +308,103 @@ def scrape_episode(url: str):
         "next_url": next_url,
     }
 
+
+def scrape_episode(url: str):
+    print(f"\nFetching: {url}")
+    resp = SESSION.get(url, timeout=30)
+    resp.raise_for_status()
+    return parse_episode_soup(
+        BeautifulSoup(resp.content, "lxml", parse_only=_PAGE_STRAINER), url
+    )
+
 # -----------------------------------------------------------
 # CRAWLER
 # -----------------------------------------------------------
-def crawl_episodes(start_url: str, max_pages: int):
-    episodes = []
+def log_page(data, current_url, i, max_pages, start_time):
+    elapsed = time.time() - start_time
+    elapsed_str = time.strftime("%H:%M:%S", time.gmtime(elapsed))
+
+    print(f"\n=== PAGE {i+1}/{max_pages} ===")
+    print(f"Episode: {data.get('episode_title')}")
+    print(f"Date:    {data.get('raw_date')} (ISO: {data.get('iso_date')})")
+    print(f"URL:     {current_url}")
+    print(f"Elapsed: {elapsed_str}")
+    print(f"Showdowns found: {len(data.get('showcase_showdowns', []))}")
+
+    # ETA estimate
+    if i > 0:
+        avg_per_page = elapsed / (i + 1)
+        remaining = max_pages - (i + 1)
+        eta_seconds = avg_per_page * remaining
+        eta_str = time.strftime("%H:%M:%S", time.gmtime(eta_seconds))
+        print(f"ETA:     ~{eta_str}")
+
+    print("==========================\n")
+
+
+async def _fetch_async(session, sem, url):
+    async with sem:
+        async with session.get(url) as resp:
+            resp.raise_for_status()
+            # raw bytes: lxml does its own (faster) encoding detection
+            return await resp.read()
+
+
+async def _crawl_async(start_url: str, max_pages: int, on_episode):
+    """Async crawl: the chain is sequential (each next_url comes from the
+    parsed page), so resolve next_url first and start its download while
+    the rest of the current page is still being extracted.
+
+    Each finished episode goes straight to `on_episode`, so everything
+    scraped so far survives Ctrl-C.
+    """
+    sem = asyncio.Semaphore(8)
+    prefetched = {}  # url -> in-flight fetch task
+    connector = aiohttp.TCPConnector(limit_per_host=8, keepalive_timeout=60)
+    async with aiohttp.ClientSession(
+        connector=connector, headers={"User-Agent": "Mozilla/5.0"}
+    ) as session:
+        current_url = start_url
+        start_time = time.time()
+
+        try:
+            for i in range(max_pages):
+                print(f"\nFetching: {current_url}")
+                task = prefetched.pop(
+                    current_url,
+                    None,
+                ) or asyncio.ensure_future(_fetch_async(session, sem, current_url))
+                try:
+                    html = await task
+                except Exception as e:
+                    print(f"Error on {current_url}: {e}")
+                    break
+
+                soup = BeautifulSoup(html, "lxml", parse_only=_PAGE_STRAINER)
+
+                # Kick off the next download before the (CPU-heavy)
+                # extraction of this page
+                next_url = find_next_url(soup, current_url)
+                if next_url and next_url not in prefetched:
+                    prefetched[next_url] = asyncio.ensure_future(
+                        _fetch_async(session, sem, next_url)
+                    )
+
+                data = parse_episode_soup(soup, current_url)
+                on_episode(data)
+                log_page(data, current_url, i, max_pages, start_time)
+
+                if not next_url:
+                    print("No next page found; stopping.")
+                    break
+                current_url = next_url
+                await asyncio.sleep(REQUEST_DELAY)
+        finally:
+            for task in prefetched.values():
+                task.cancel()
+
+
+def _crawl_sync(start_url: str, max_pages: int, on_episode):
     current_url = start_url
     start_time = time.time()
 
@@ -215,33 +413,13 @@ def crawl_episodes(start_url: str, max_pages: int):
             data = scrape_episode(current_url)
         except KeyboardInterrupt:
             print("\n\n=== CTRL-C detected during crawl — stopping early ===\n")
-            break  # <-- break the loop but KEEP everything already in `episodes`
+            break  # <-- break the loop; everything is already on disk
         except Exception as e:
             print(f"Error on {current_url}: {e}")
             break
 
-        episodes.append(data)
-
-        # ---- Enhanced Logging Block ----
-        elapsed = time.time() - start_time
-        elapsed_str = time.strftime("%H:%M:%S", time.gmtime(elapsed))
-
-        print(f"\n=== PAGE {i+1}/{max_pages} ===")
-        print(f"Episode: {data.get('episode_title')}")
-        print(f"Date:    {data.get('raw_date')} (ISO: {data.get('iso_date')})")
-        print(f"URL:     {current_url}")
-        print(f"Elapsed: {elapsed_str}")
-        print(f"Showdowns found: {len(data.get('showcase_showdowns', []))}")
-
-        # ETA estimate
-        if i > 0:
-            avg_per_page = elapsed / (i + 1)
-            remaining = max_pages - (i + 1)
-            eta_seconds = avg_per_page * remaining
-            eta_str = time.strftime("%H:%M:%S", time.gmtime(eta_seconds))
-            print(f"ETA:     ~{eta_str}")
-
-        print("==========================\n")
+        on_episode(data)
+        log_page(data, current_url, i, max_pages, start_time)
 
         # Check next page
         next_url = data.get("next_url")
@@ -255,42 +433,51 @@ def crawl_episodes(start_url: str, max_pages: int):
             time.sleep(REQUEST_DELAY)
         except KeyboardInterrupt:
             print("\n\n=== CTRL-C detected during sleep — stopping early ===\n")
-            break  # <-- KEEP accumulated episodes
+            break  # <-- everything is already on disk
 
-    return episodes
+
+def crawl_episodes(start_url: str, max_pages: int, on_episode):
+    if aiohttp is not None:
+        try:
+            asyncio.run(_crawl_async(start_url, max_pages, on_episode))
+        except KeyboardInterrupt:
+            print("\n\n=== CTRL-C detected during crawl — stopping early ===\n")
+    else:
+        _crawl_sync(start_url, max_pages, on_episode)
 
 
 # -----------------------------------------------------------
 # MAIN
 # -----------------------------------------------------------
 if __name__ == "__main__":
-    episodes_data = []
-    try:
-        # Start crawling
-        episodes_data = crawl_episodes(START_URL, MAX_PAGES)
-
-    except KeyboardInterrupt:
-        print("\n\n=== CTRL-C detected! Saving partial results... ===\n")
-
-    finally:
-        # Whether crawl completed or was interrupted, save what we have
-        full_output_file = "tpir_episodes_full.json"
-        with open(full_output_file, "w", encoding="utf-8") as f:
-            json.dump(episodes_data, f, ensure_ascii=False, indent=2)
-
-        showcases_only = []
-        for ep in episodes_data:
-            showcases_only.append({
+    # Episodes stream to JSONL as they are scraped instead of piling up in
+    # memory for the final dump — a full 20k-page crawl would otherwise hold
+    # 100MB+ of live dicts, and a crash would lose everything.
+    full_output_file = "tpir_episodes_full.jsonl"
+    output_file = "tpir_showcases_only.jsonl"
+    saved = 0
+
+    with open(full_output_file, "wb") as f_full, \
+            open(output_file, "wb") as f_showcases:
+
+        def write_episode(ep):
+            global saved
+            f_full.write(_json_line(ep))
+            f_showcases.write(_json_line({
                 "episode_title": ep.get("episode_title"),
                 "raw_date": ep.get("raw_date"),
                 "iso_date": ep.get("iso_date"),
                 "showcase_showdowns": ep.get("showcase_showdowns", []),
-            })
+            }))
+            f_full.flush()
+            f_showcases.flush()
+            saved += 1
 
-        output_file = "tpir_showcases_only.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(showcases_only, f, ensure_ascii=False, indent=2)
+        try:
+            crawl_episodes(START_URL, MAX_PAGES, write_episode)
+        except KeyboardInterrupt:
+            print("\n\n=== CTRL-C detected! Partial results already saved. ===\n")
 
-        print(f"\nSaved {len(episodes_data)} episodes to {full_output_file}")
-        print(f"Saved {len(showcases_only)} showcase-only entries to {output_file}")
-        print("\n=== Done. Exiting cleanly. ===\n")
\ No newline at end of file
+    print(f"\nSaved {saved} episodes to {full_output_file}")
+    print(f"Saved {saved} showcase-only entries to {output_file}")
+    print("\n=== Done. Exiting cleanly. ===\n")
\ No newline at end of file
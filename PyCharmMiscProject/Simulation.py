@@ -24,10 +24,13 @@ Notes:
       * in the middle, QRE/logit around equilibrium using payoff gaps Δ and lambda_C2
 """
 
+import functools
 import random
 import math
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -40,9 +43,22 @@ import matplotlib.pyplot as plt
 
 WHEEL_VALUES = list(range(5, 105, 5))  # 5,10,...,100
 
+# Scalar spins come from a preallocated PCG64 buffer: one bulk draw per
+# ~1M spins is far cheaper than a Mersenne Twister call per spin, and the
+# values fit in uint8.
+_RNG = np.random.default_rng(42)
+_SPIN_BUF = _RNG.integers(1, 21, size=1 << 20, dtype=np.uint8) * 5
+_SPIN_IDX = 0
+
 
 def spin_once() -> int:
-    return random.choice(WHEEL_VALUES)
+    global _SPIN_BUF, _SPIN_IDX
+    if _SPIN_IDX >= _SPIN_BUF.size:
+        _SPIN_BUF = _RNG.integers(1, 21, size=_SPIN_BUF.size, dtype=np.uint8) * 5
+        _SPIN_IDX = 0
+    v = _SPIN_BUF[_SPIN_IDX]
+    _SPIN_IDX += 1
+    return int(v)
 
 
 def take_second_spin_if_needed(first: int) -> int:
@@ -54,8 +70,18 @@ def take_second_spin_if_needed(first: int) -> int:
 
 def resolve_spinoff(contenders: List[str]) -> str:
     """Repeated single-spin tie-break until unique winner."""
+    return _resolve_spinoff_rng(contenders, random)
+
+
+def _resolve_spinoff_rng(contenders: List[str], rng) -> str:
+    """resolve_spinoff against an explicit RNG (random module or Random
+    instance), so callers can replay a tie-break under a fixed seed."""
+    # A two-way spin-off is a fair coin by symmetry — both contenders draw
+    # from the same uniform wheel until someone is ahead — so skip sampling.
+    if len(contenders) == 2:
+        return contenders[0] if rng.random() < 0.5 else contenders[1]
     while True:
-        spins = {c: spin_once() for c in contenders}
+        spins = {c: rng.choice(WHEEL_VALUES) for c in contenders}
         m = max(spins.values())
         winners = [c for c, v in spins.items() if v == m]
         if len(winners) == 1:
@@ -81,6 +107,34 @@ def c3_policy(best_value: int, c3_first: int) -> str:
     return "spin_again" if c3_first <= 50 else "stay"
 
 
+# Payoff-gap tables are flat 21-entry arrays indexed by first_spin // 5, so
+# the per-turn lookup in c2_policy is a plain index instead of a dict hash.
+DeltasC2 = Union[Dict[int, float], Sequence[float]]
+
+
+def _deltas_table(deltas: Optional[DeltasC2]) -> Sequence[float]:
+    """Normalize a {first_spin: delta} dict (or None) to the flat table;
+    tables pass through untouched. 0.01 fills unspecified spins."""
+    if deltas is None:
+        deltas = {}
+    if isinstance(deltas, dict):
+        table = array("d", [0.01] * 21)
+        for s, d in deltas.items():
+            table[s // 5] = d
+        return table
+    return deltas
+
+
+# c3_policy only depends on (best_value, c3_first), both multiples of 5 in
+# [0, 100] — partial-evaluate it into a 21x21 table at import so the hot
+# paths do one cache-resident load instead of three branches.
+# _C3_TABLE[best_value // 5, c3_first // 5] == 1 means spin_again.
+_C3_TABLE = np.zeros((21, 21), dtype=np.uint8)
+for _bv in range(0, 105, 5):
+    for _cf in range(5, 105, 5):
+        _C3_TABLE[_bv // 5, _cf // 5] = c3_policy(_bv, _cf) == "spin_again"
+
+
 def c2_equilibrium_action(first_spin: int, c1_total: int) -> str:
     """
     Equilibrium-ish action for C2 (used as the "anchor" action in QRE).
@@ -97,8 +151,13 @@ def c2_equilibrium_action(first_spin: int, c1_total: int) -> str:
     return "stay"
 
 
+@functools.lru_cache(maxsize=1024)
 def qre_follow_prob(delta: float, lam: float) -> float:
-    """Logit / quantal response probability of choosing the equilibrium action."""
+    """Logit / quantal response probability of choosing the equilibrium action.
+
+    (delta, lam) pairs come from small fixed tables, so the memo turns the
+    per-call math.exp in the scalar policies into a dict hit.
+    """
     return 1.0 / (1.0 + math.exp(-lam * delta))
 
 
@@ -106,7 +165,7 @@ def c2_policy(
     first_spin: int,
     c1_total: int,
     lambda_c2: float,
-    deltas_c2: Dict[int, float],
+    deltas_c2: Sequence[float],
     force_70_stay_prob: float = 0.90,
     extreme_spin_leq: int = 30,
     extreme_stay_geq: int = 75,
@@ -132,7 +191,7 @@ def c2_policy(
         return "stay"
 
     eq = c2_equilibrium_action(first_spin, c1_total)
-    delta = deltas_c2.get(first_spin, 0.01)  # small default if missing
+    delta = deltas_c2[first_spin // 5]
     p_follow = qre_follow_prob(delta, lambda_c2)
 
     if random.random() < p_follow:
@@ -169,7 +228,7 @@ def c1_policy_hybrid(
 # One full showdown simulation
 # ---------------------------
 
-@dataclass
+@dataclass(slots=True)
 class SimOutcome:
     winner: Optional[str]              # "C1", "C2", "C3", or None (all bust)
     c1_total: int
@@ -191,11 +250,10 @@ def simulate_showdown(
     c1_first_fixed: Optional[int] = None,
     c1_forced_action: str = "hybrid",  # "hybrid" | "stay" | "spin_again"
     lambda_c2: float = 15.0,
-    deltas_c2: Optional[Dict[int, float]] = None,
+    deltas_c2: Optional[DeltasC2] = None,
     force_70_stay_prob: float = 0.90,
 ) -> SimOutcome:
-    if deltas_c2 is None:
-        deltas_c2 = {}
+    deltas_c2 = _deltas_table(deltas_c2)
 
     # ----- C1 -----
     c1_first = c1_first_fixed if c1_first_fixed is not None else spin_once()
@@ -236,7 +294,7 @@ def simulate_showdown(
 
     # ----- C3 -----
     c3_first = spin_once()
-    c3_action = c3_policy(best_value, c3_first)
+    c3_action = "spin_again" if _C3_TABLE[best_value // 5, c3_first // 5] else "stay"
     c3_total = c3_first if c3_action == "stay" else take_second_spin_if_needed(c3_first)
 
     # Final resolution: compare C3 against best_owner/best_value
@@ -269,6 +327,125 @@ def simulate_showdown(
     )
 
 
+# ---------------------------
+# Vectorized batch simulation
+# ---------------------------
+# The sensitivity sweep runs trials × |lambdas| × |first spins| showdowns;
+# simulating them one at a time through simulate_showdown costs several
+# microseconds of Python dispatch per trial. The batch version plays all
+# trials of one sweep cell simultaneously as NumPy arrays; only the rare
+# tied rows (~5%) need the iterative spin-off loop, and even that works on
+# whole arrays of tied rows at once.
+
+def _spin_batch(rng, n: int) -> np.ndarray:
+    return rng.integers(1, 21, size=n) * 5
+
+
+def _apply_second_spin(first: np.ndarray, spin_mask: np.ndarray, rng) -> np.ndarray:
+    """Totals after optionally spinning again: bust (total > 100) becomes 0."""
+    total = first.copy()
+    n = int(spin_mask.sum())
+    if n:
+        t = first[spin_mask] + _spin_batch(rng, n)
+        t[t > 100] = 0
+        total[spin_mask] = t
+    return total
+
+
+def _resolve_spinoff_batch(rng, n: int) -> np.ndarray:
+    """Tie-break n two-way spin-offs at once; True where the first contender
+    wins. A two-way spin-off is a fair coin by symmetry, so one uniform draw
+    per tie replaces the resample-until-unequal loop."""
+    return rng.random(n) < 0.5
+
+
+def simulate_showdowns_batch(
+    trials: int,
+    *,
+    rng,
+    c1_first_fixed: Optional[int] = None,
+    c1_forced_action: str = "hybrid",
+    lambda_c2: float = 15.0,
+    deltas_c2: Optional[DeltasC2] = None,
+    force_70_stay_prob: float = 0.90,
+) -> np.ndarray:
+    """
+    Play `trials` independent showdowns at once under the same policies as
+    simulate_showdown. Returns an int8 array of winner codes:
+    0 = all bust, 1 = C1, 2 = C2, 3 = C3.
+    """
+    deltas_c2 = _deltas_table(deltas_c2)
+
+    # ----- C1 -----
+    if c1_first_fixed is not None:
+        c1_first = np.full(trials, c1_first_fixed, dtype=np.int64)
+    else:
+        c1_first = _spin_batch(rng, trials)
+
+    if c1_forced_action == "stay":
+        c1_spin2 = np.zeros(trials, dtype=bool)
+    elif c1_forced_action == "spin_again":
+        c1_spin2 = np.ones(trials, dtype=bool)
+    elif c1_forced_action == "hybrid":
+        eq_spin = c1_first <= 65
+        follow = rng.random(trials) < qre_follow_prob(0.05, 11.0)
+        c1_spin2 = np.where(follow, eq_spin, ~eq_spin)
+        c1_spin2[c1_first <= 30] = True
+        c1_spin2[c1_first >= 75] = False
+    else:
+        raise ValueError("c1_forced_action must be 'hybrid', 'stay', or 'spin_again'")
+
+    c1_total = _apply_second_spin(c1_first, c1_spin2, rng)
+
+    # ----- C2 -----
+    # Same rules as c2_policy, applied in reverse priority so the later
+    # (higher-priority) assignments overwrite: QRE middle, then extremes,
+    # then the tie override, then the 70 rule.
+    c2_first = _spin_batch(rng, trials)
+    tie = (c2_first == c1_total) & (c1_total != 0)
+    eq_spin = np.where(tie, c1_total < 50, c2_first <= 55)
+    # Follow probabilities only depend on the 21 possible first spins, so
+    # evaluate the logit on the 21-entry table and gather, instead of
+    # exponentiating a trials-long array
+    delta_tab = np.asarray(deltas_c2, dtype=np.float64)
+    p_follow_tab = 1.0 / (1.0 + np.exp(-lambda_c2 * delta_tab))
+    follow = rng.random(trials) < p_follow_tab[c2_first // 5]
+    c2_spin2 = np.where(follow, eq_spin, ~eq_spin)
+    c2_spin2[c2_first <= 30] = True
+    c2_spin2[c2_first >= 75] = False
+    c2_spin2[tie] = c1_total[tie] < 50
+    is70 = c2_first == 70
+    c2_spin2[is70] = rng.random(int(is70.sum())) >= force_70_stay_prob
+
+    c2_total = _apply_second_spin(c2_first, c2_spin2, rng)
+
+    # Resolve C1 vs C2 (spin-off on ties)
+    best_owner = np.zeros(trials, dtype=np.int8)  # 0 = none yet (both bust)
+    best_value = np.maximum(c1_total, c2_total)
+    best_owner[c1_total > c2_total] = 1
+    best_owner[c2_total > c1_total] = 2
+    tie12 = (c1_total != 0) & (c1_total == c2_total)
+    if tie12.any():
+        c1_wins = _resolve_spinoff_batch(rng, int(tie12.sum()))
+        best_owner[tie12] = np.where(c1_wins, 1, 2)
+
+    # ----- C3 -----
+    c3_first = _spin_batch(rng, trials)
+    c3_spin2 = _C3_TABLE[best_value // 5, c3_first // 5].astype(bool)
+    c3_total = _apply_second_spin(c3_first, c3_spin2, rng)
+
+    winner = best_owner.copy()
+    none_mask = best_owner == 0
+    winner[none_mask & (c3_total != 0)] = 3
+    winner[~none_mask & (c3_total > best_value)] = 3
+    tie23 = ~none_mask & (c3_total != 0) & (c3_total == best_value)
+    if tie23.any():
+        owner_wins = _resolve_spinoff_batch(rng, int(tie23.sum()))
+        winner[tie23] = np.where(owner_wins, best_owner[tie23], 3)
+
+    return winner
+
+
 # ---------------------------
 # Payoff gap (Δ) estimation for C2
 # ---------------------------
@@ -290,106 +467,64 @@ def estimate_delta_c2_for_first_spin(
     Important:
       - This compares C2's win rate under two forced actions (eq vs dev)
       - C1 is simulated under its HYBRID policy (not forced), so C2 sees realistic C1 totals.
+      - Common random numbers: each trial draws ONE shared context (C1 play,
+        C2 second spin, C3 spins, spin-off seed) and plays both branches
+        against it, so branch-to-branch noise cancels in the Δ difference.
+        (lambda_c2_for_eval/deltas_c2_for_eval are kept for call
+        compatibility; C2's own mixing never affected the C1 context.)
     """
     eq_wins = 0
     dev_wins = 0
 
     for _ in range(trials):
-        # simulate C1 under hybrid to generate a realistic c1_total for the context
-        c1_out = simulate_showdown(
-            c1_first_fixed=None,
-            c1_forced_action="hybrid",
-            lambda_c2=lambda_c2_for_eval,
-            deltas_c2=deltas_c2_for_eval,
-            force_70_stay_prob=force_70_stay_prob,
-        )
-        c1_total = c1_out.c1_total
-
-        # determine what "equilibrium" action would be in THIS context
-        eq_action = c2_equilibrium_action(first_spin, c1_total)
-        dev_action = "stay" if eq_action == "spin_again" else "spin_again"
-
-        # ---- EQ branch ----
-        # Re-play a showdown, but force:
-        #   - C1 to use the SAME fixed total context? We can’t directly “pin” totals without contortions,
-        #     so instead we re-simulate the whole game with a fixed C1 first spin and hybrid play.
-        # For payoff-gap stability, we focus on C2’s relative outcome under forcing eq vs dev,
-        # keeping everything else identically distributed. This is standard Monte Carlo.
-        #
-        # We’ll emulate forcing C2 by running a custom mini-sim below rather than calling simulate_showdown twice.
-
-        # Simulate C1 (one more time) to pair with forced C2 action:
+        # ---- shared context for both branches ----
         c1_first = spin_once()
         a1 = c1_policy_hybrid(c1_first)
-        c1_total2 = c1_first if a1 == "stay" else take_second_spin_if_needed(c1_first)
+        c1_total = c1_first if a1 == "stay" else take_second_spin_if_needed(c1_first)
 
-        # Force C2 eq
-        c2_total_eq = first_spin if eq_action == "stay" else take_second_spin_if_needed(first_spin)
+        # determine what "equilibrium" action would be in THIS context
+        eq_action = c2_equilibrium_action(first_spin, c1_total)
 
-        # resolve C1 vs C2
-        if c1_total2 != 0 and c1_total2 == c2_total_eq:
-            best_owner_eq = resolve_spinoff(["C1", "C2"])
-            best_value_eq = c1_total2
-        else:
-            if c1_total2 > c2_total_eq:
-                best_owner_eq, best_value_eq = "C1", c1_total2
-            elif c2_total_eq > c1_total2:
-                best_owner_eq, best_value_eq = "C2", c2_total_eq
-            else:
-                best_owner_eq, best_value_eq = None, 0
+        # one shared second-spin outcome for whichever branch spins
+        # (eq and dev take opposite actions, so exactly one of them uses it)
+        c2_spin_total = take_second_spin_if_needed(first_spin)
+        c2_total_eq = first_spin if eq_action == "stay" else c2_spin_total
+        c2_total_dev = c2_spin_total if eq_action == "stay" else first_spin
 
-        # C3
         c3_first = spin_once()
-        a3 = c3_policy(best_value_eq, c3_first)
-        c3_total = c3_first if a3 == "stay" else take_second_spin_if_needed(c3_first)
-
-        if best_owner_eq is None:
-            winner_eq = "C3" if c3_total != 0 else None
-        else:
-            if c3_total != 0 and c3_total == best_value_eq:
-                winner_eq = resolve_spinoff([best_owner_eq, "C3"])
-            elif c3_total > best_value_eq:
-                winner_eq = "C3"
+        c3_second = spin_once()
+        spinoff_seed = random.getrandbits(32)
+
+        def play_out(c2_total):
+            # identical spin-off draws across branches via the shared seed
+            rng = random.Random(spinoff_seed)
+
+            if c1_total != 0 and c1_total == c2_total:
+                best_owner = _resolve_spinoff_rng(["C1", "C2"], rng)
+                best_value = c1_total
+            elif c1_total > c2_total:
+                best_owner, best_value = "C1", c1_total
+            elif c2_total > c1_total:
+                best_owner, best_value = "C2", c2_total
             else:
-                winner_eq = best_owner_eq
+                best_owner, best_value = None, 0
 
-        if winner_eq == "C2":
-            eq_wins += 1
-
-        # ---- DEV branch ----
-        # Re-simulate fresh (same distribution) with forced deviation action.
-        c1_first = spin_once()
-        a1 = c1_policy_hybrid(c1_first)
-        c1_total3 = c1_first if a1 == "stay" else take_second_spin_if_needed(c1_first)
-
-        c2_total_dev = first_spin if dev_action == "stay" else take_second_spin_if_needed(first_spin)
-
-        if c1_total3 != 0 and c1_total3 == c2_total_dev:
-            best_owner_dev = resolve_spinoff(["C1", "C2"])
-            best_value_dev = c1_total3
-        else:
-            if c1_total3 > c2_total_dev:
-                best_owner_dev, best_value_dev = "C1", c1_total3
-            elif c2_total_dev > c1_total3:
-                best_owner_dev, best_value_dev = "C2", c2_total_dev
+            if _C3_TABLE[best_value // 5, c3_first // 5]:
+                c3_total = c3_first + c3_second if c3_first + c3_second <= 100 else 0
             else:
-                best_owner_dev, best_value_dev = None, 0
-
-        c3_first = spin_once()
-        a3 = c3_policy(best_value_dev, c3_first)
-        c3_total = c3_first if a3 == "stay" else take_second_spin_if_needed(c3_first)
+                c3_total = c3_first
 
-        if best_owner_dev is None:
-            winner_dev = "C3" if c3_total != 0 else None
-        else:
-            if c3_total != 0 and c3_total == best_value_dev:
-                winner_dev = resolve_spinoff([best_owner_dev, "C3"])
-            elif c3_total > best_value_dev:
-                winner_dev = "C3"
-            else:
-                winner_dev = best_owner_dev
+            if best_owner is None:
+                return "C3" if c3_total != 0 else None
+            if c3_total != 0 and c3_total == best_value:
+                return _resolve_spinoff_rng([best_owner, "C3"], rng)
+            if c3_total > best_value:
+                return "C3"
+            return best_owner
 
-        if winner_dev == "C2":
+        if play_out(c2_total_eq) == "C2":
+            eq_wins += 1
+        if play_out(c2_total_dev) == "C2":
             dev_wins += 1
 
     p_eq = eq_wins / trials
@@ -404,13 +539,14 @@ def build_deltas_c2(
     trials_per_spin: int = 120_000,
     lambda_c2_for_eval: float = 15.0,
     force_70_stay_prob: float = 0.90,
-) -> Dict[int, float]:
+) -> Sequence[float]:
     """
-    Estimate a delta table for a list of first-spin values.
+    Estimate a delta table for a list of first-spin values; returns the
+    flat 21-entry table indexed by first_spin // 5.
     """
-    deltas: Dict[int, float] = {}
-    # start with a tiny baseline so c2_policy can run during eval without missing keys
-    baseline: Dict[int, float] = {s: 0.01 for s in spins}
+    deltas = array("d", [0.01] * 21)
+    # tiny baseline so c2_policy can run during eval without missing entries
+    baseline = {s: 0.01 for s in spins}
     for s in spins:
         d, p_eq, p_dev = estimate_delta_c2_for_first_spin(
             s,
@@ -419,8 +555,8 @@ def build_deltas_c2(
             deltas_c2_for_eval=baseline,
             force_70_stay_prob=force_70_stay_prob,
         )
-        deltas[s] = max(0.0, d)  # clamp negative deltas to 0 if you want purely “follow eq” incentives
-        print(f"[Δ-est] spin={s:>3}  Δ={deltas[s]:.4f}  p_eq={p_eq:.4f}  p_dev={p_dev:.4f}")
+        deltas[s // 5] = max(0.0, d)  # clamp negative deltas to 0 if you want purely “follow eq” incentives
+        print(f"[Δ-est] spin={s:>3}  Δ={deltas[s // 5]:.4f}  p_eq={p_eq:.4f}  p_dev={p_dev:.4f}")
     return deltas
 
 
@@ -428,40 +564,57 @@ def build_deltas_c2(
 # Sensitivity sweep + plotting
 # ---------------------------
 
+def _run_sweep_cell(args) -> Tuple[int, str, float, int]:
+    """Simulate one (first spin, forced action, lambda) cell; returns C1 wins.
+
+    Each worker draws its own OS-entropy RNG so streams aren't correlated
+    across processes.
+    """
+    fs, forced, lam, trials, deltas_c2, force_70_stay_prob = args
+    winners = simulate_showdowns_batch(
+        trials,
+        rng=np.random.default_rng(),
+        c1_first_fixed=fs,
+        c1_forced_action=forced,
+        lambda_c2=lam,
+        deltas_c2=deltas_c2,
+        force_70_stay_prob=force_70_stay_prob,
+    )
+    return fs, forced, lam, int((winners == 1).sum())
+
+
 def sensitivity_sweep(
     *,
     c1_first_spins: List[int],
     lambdas_c2: List[float],
     trials: int,
-    deltas_c2: Dict[int, float],
+    deltas_c2: DeltasC2,
     force_70_stay_prob: float = 0.90,
 ) -> pd.DataFrame:
+    # Every sweep cell is independent, so fan them out across cores (same
+    # ProcessPoolExecutor pattern as the parsers)
+    cells = [
+        (fs, forced, lam, trials, deltas_c2, force_70_stay_prob)
+        for fs in c1_first_spins
+        for forced in ["stay", "spin_again"]
+        for lam in lambdas_c2
+    ]
+    with ProcessPoolExecutor() as ex:
+        results = ex.map(_run_sweep_cell, cells)
+
     rows = []
-    for fs in c1_first_spins:
-        for forced in ["stay", "spin_again"]:
-            for lam in lambdas_c2:
-                wins = 0
-                for _ in range(trials):
-                    out = simulate_showdown(
-                        c1_first_fixed=fs,
-                        c1_forced_action=forced,
-                        lambda_c2=lam,
-                        deltas_c2=deltas_c2,
-                        force_70_stay_prob=force_70_stay_prob,
-                    )
-                    wins += 1 if out.winner == "C1" else 0
-
-                p = wins / trials
-                se = math.sqrt(p * (1 - p) / trials)
-                rows.append({
-                    "C1 first spin": fs,
-                    "Forced strategy": forced,
-                    "lambda_C2": lam,
-                    "Win rate": p,
-                    "SE": se,
-                    "CI95_low": max(0.0, p - 1.96 * se),
-                    "CI95_high": min(1.0, p + 1.96 * se),
-                })
+    for fs, forced, lam, wins in results:
+        p = wins / trials
+        se = math.sqrt(p * (1 - p) / trials)
+        rows.append({
+            "C1 first spin": fs,
+            "Forced strategy": forced,
+            "lambda_C2": lam,
+            "Win rate": p,
+            "SE": se,
+            "CI95_low": max(0.0, p - 1.96 * se),
+            "CI95_high": min(1.0, p + 1.96 * se),
+        })
     return pd.DataFrame(rows)
 
 
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Single-pass TPIR showdown pipeline.
+
+Loads tpir_episodes_combined.json once, parses each showdown once via
+tpir_parse, then runs the validator (Process.py's outputs) on the parsed
+objects — previously Process.py re-read and re-tokenized the whole file
+per run.
+
+The scenario datasets (structured_showdowns.json / scenario_N_*.json)
+are deliberately NOT written here: Parser(1-3).py builds them from its
+own parsing rules ('+'-gated second spins, displayed-total dedup), which
+disagree with tpir_parse's spin extraction, and emitting them from both
+drivers would let one silently clobber the other with incompatible data.
+
+Outputs:
+    tpir_structured_showdowns.json
+    tpir_showdown_parse_errors.json
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+from Process import INPUT_PATH, OUTPUT_ERRORS, OUTPUT_STRUCTURED, process_episode
+from tpir_parse import (
+    batched_episodes,
+    dump_json,
+    iter_episodes,
+    parse_showdown,
+)
+
+
+def main():
+    structured_episodes = []
+    error_showdowns = []
+    stats = {"total": 0, "kept": 0, "parse_errors": 0, "validation_errors": 0}
+
+    with ProcessPoolExecutor() as ex:
+        for batch in batched_episodes(iter_episodes(INPUT_PATH)):
+            texts = [
+                sd.get("text", "")
+                for ep in batch
+                for sd in ep.get("showcase_showdowns", [])
+            ]
+            parsed_batch = list(ex.map(parse_showdown, texts, chunksize=128))
+
+            # Validation + keep/reject on the shared parsed objects
+            parsed_iter = iter(parsed_batch)
+            for ep in batch:
+                new_ep = process_episode(ep, parsed_iter, stats, error_showdowns)
+                if new_ep is not None:
+                    structured_episodes.append(new_ep)
+
+    # Validator outputs (errors stay indented for hand inspection)
+    dump_json(structured_episodes, OUTPUT_STRUCTURED)
+    dump_json(error_showdowns, OUTPUT_ERRORS, indent=True)
+
+    print(f"Total showdowns seen: {stats['total']}")
+    print(f"Showdowns kept (good): {stats['kept']}")
+    print(f"Showdowns with structural issues: {stats['parse_errors']}")
+    print(f"Showdowns with validation issues: {stats['validation_errors']}")
+    print(f"Episodes with at least one valid showdown: {len(structured_episodes)}")
+
+
+if __name__ == "__main__":
+    main()
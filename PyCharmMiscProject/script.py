@@ -1,16 +1,21 @@
+import functools
 import re
 import os
+from concurrent.futures import ThreadPoolExecutor
 from io import StringIO
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 
 URL = "https://support.google.com/chromeosflex/answer/11513094?hl=en"
 
 # --- fetch HTML ---
 r = requests.get(URL, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
 r.raise_for_status()
-soup = BeautifulSoup(r.text, "lxml")
+# only the vendor wrappers are ever queried, so skip building the rest
+# of the support page's tree
+_ONLY_WRAPPERS = SoupStrainer("div", class_="zippy-wrapper")
+soup = BeautifulSoup(r.text, "lxml", parse_only=_ONLY_WRAPPERS)
 
 # --- helpers ---
 def normalize_columns(cols):
@@ -30,31 +35,28 @@ def clean_status(s):
         .strip()
         .replace("  "," "))
 
-def strip_vendor_prefix(model: str, vendor: str) -> str:
-    """Remove leading vendor name from model string if present."""
-    if pd.isna(model) or pd.isna(vendor):
-        return model
-    s = str(model).strip()
-    v = str(vendor).strip()
-    if not v:
-        return s
+_MULTI_WS = re.compile(r"\s{2,}")
+_SAFE = re.compile(r"[^A-Za-z0-9._-]+")
+
 
-    ven = re.escape(v)
-    # allow one or more vendor occurrences at start, followed by space/hyphen/underscore/colon
-    pat = re.compile(rf"^(?:{ven})(?:\s+|[-–—_:])+(.+)$", re.IGNORECASE)
-    changed = False
-    while True:
-        m = pat.match(s)
-        if not m:
-            break
-        s = m.group(1).strip()
-        changed = True
+@functools.lru_cache(maxsize=4096)
+def _vendor_pat(v: str) -> re.Pattern:
+    # one or more vendor occurrences at start, each followed by
+    # space/hyphen/underscore/colon — the outer + collapses repeated
+    # prefixes ("Dell Dell XPS") in a single match, no re-apply loop
+    return re.compile(rf"^(?:(?:{re.escape(v)})(?:\s+|[-–—_:])+)+", re.IGNORECASE)
 
-    if not s:  # don’t blank it out
-        return str(model).strip()
 
-    s = re.sub(r"\s{2,}", " ", s).strip()
-    return s
+def strip_vendor_prefix(models: pd.Series, vendor: str) -> pd.Series:
+    """Remove leading vendor name from a vendor's Model column if present."""
+    v = str(vendor).strip()
+    orig = models.astype(str).str.strip()
+    if not v:
+        return orig
+
+    s = orig.str.replace(_vendor_pat(v), "", regex=True)
+    s = s.str.replace(_MULTI_WS, " ", regex=True).str.strip()
+    return s.where(s.ne(""), orig)  # don’t blank models out
 
 rows = []
 
@@ -62,12 +64,24 @@ rows = []
 wrappers = soup.select("div.zippy-wrapper")
 print(f"Found vendor wrappers: {len(wrappers)}")
 
-for w in wrappers:
+# Parse every table in one lxml pass, then slice the result per wrapper
+# by its table count — avoids re-invoking read_html per <table>
+wrapper_tables = [w.select("table") for w in wrappers]
+all_tables = pd.read_html(StringIO(r.text), flavor="lxml")
+if len(all_tables) != sum(len(t) for t in wrapper_tables):
+    # document has tables outside the wrappers; realign by parsing only
+    # the wrapper tables (still a single read_html call)
+    all_tables = pd.read_html(
+        StringIO("".join(str(t) for tbls in wrapper_tables for t in tbls)),
+        flavor="lxml",
+    )
+
+offset = 0
+for w, tbls in zip(wrappers, wrapper_tables):
     a = w.select_one("a.zippy")
     vendor = a.get_text(strip=True) if a else "Unknown"
 
-    for tbl in w.select("table"):
-        df = pd.read_html(StringIO(str(tbl)), flavor="lxml")[0]
+    for df in all_tables[offset:offset + len(tbls)]:
         df.columns = normalize_columns(df.columns)
 
         if "Status" in df.columns:
@@ -83,14 +97,32 @@ for w in wrappers:
         df.insert(0, "Vendor", vendor)
         rows.append(df)
 
+    offset += len(tbls)
+
 # --- combine all ---
-final = pd.concat(rows, ignore_index=True)
+# sort=False skips the column-reordering pass (all frames already share
+# the normalized column order); copy-on-write already defers the data
+# copy, so no copy=False needed (deprecated in pandas 3)
+final = pd.concat(rows, ignore_index=True, sort=False)
+
+# Vendor/Status repeat heavily; categorical codes make the groupby,
+# drop_duplicates and sort below hash small ints instead of strings
+final["Vendor"] = final["Vendor"].astype("category")
+if "Status" in final.columns:
+    final["Status"] = final["Status"].astype("category")
+
+# models repeat across tables — dedup first so the vendor strip only
+# touches the survivors
+dedup_cols = ["Vendor","Model","Status","Since","EndOfSupportYear"]
+final = final.drop_duplicates(subset=dedup_cols)
 
-# strip vendor prefix from Model
-final["Model"] = final.apply(lambda r: strip_vendor_prefix(r["Model"], r["Vendor"]), axis=1)
+# strip vendor prefix from Model: one vectorized str.replace per vendor
+# instead of a Python call per row
+for vendor in final["Vendor"].dropna().unique():
+    mask = final["Vendor"].eq(vendor) & final["Model"].notna()
+    final.loc[mask, "Model"] = strip_vendor_prefix(final.loc[mask, "Model"], vendor)
 
-# drop duplicates and sort
-dedup_cols = ["Vendor","Model","Status","Since","EndOfSupportYear"]
+# stripping can collapse more rows into duplicates; re-dedup, then sort
 final = final.drop_duplicates(subset=dedup_cols).sort_values(["Vendor","Model"]).reset_index(drop=True)
 
 print("Total models:", len(final))
@@ -100,11 +132,18 @@ print("Unique vendors:", final["Vendor"].nunique())
 final.to_csv("chromeos_flex_models_full.csv", index=False, encoding="utf-8")
 final.to_json("chromeos_flex_models_full.json", orient="records", indent=2, force_ascii=False)
 
-# optional per-vendor split
+# optional per-vendor split: the writes are independent small files, so
+# overlap them on a thread pool (to_csv releases the GIL while writing)
 os.makedirs("vendors", exist_ok=True)
-for vendor, dfv in final.groupby("Vendor", sort=True):
-    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", vendor)
-    dfv.to_csv(f"vendors/{safe}.csv", index=False, encoding="utf-8")
+with ThreadPoolExecutor(max_workers=8) as ex:
+    futures = []
+    for vendor, dfv in final.groupby("Vendor", sort=True, observed=True):
+        safe = _SAFE.sub("_", vendor)
+        futures.append(
+            ex.submit(dfv.to_csv, f"vendors/{safe}.csv", index=False, encoding="utf-8")
+        )
+for f in futures:
+    f.result()  # re-raise any write failure instead of dropping it
 
 # --- quick peek ---
 print(final.sample(10, random_state=1))
@@ -0,0 +1,511 @@
+#!/usr/bin/env python3
+"""
+Shared TPIR Showcase Showdown parsing core.
+
+Holds the tokenizer, contestant segmentation, showdown parser, validator,
+and scenario classifier so that Process.py and main.py parse each showdown
+exactly once instead of re-tokenizing the same text per script, plus the
+JSON IO helpers both drivers share.
+"""
+
+import json
+import re
+import sys
+from typing import List, Dict, Any, Tuple
+
+# Optional: orjson serializes large outputs ~5-10x faster than stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: ijson streams the input instead of materializing it all at once
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+# -----------------------------
+# JSON IO helpers
+# -----------------------------
+
+def iter_episodes(path: str):
+    """Yield episodes one at a time, streaming via ijson when available."""
+    if ijson is not None:
+        with open(path, "rb") as f:
+            yield from ijson.items(f, "item")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+def batched_episodes(episodes, batch_size: int = 512):
+    """Group the episode stream into lists so parsing can stay batched."""
+    batch = []
+    for ep in episodes:
+        batch.append(ep)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def dump_json(obj, path: str, indent: bool = False) -> None:
+    """Write JSON via orjson when available; compact unless indent is set.
+
+    Machine-consumed outputs stay compact (roughly half the bytes and much
+    faster to serialize); only hand-inspected files ask for indent.
+    """
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            if indent:
+                json.dump(obj, f, ensure_ascii=False, indent=2)
+            else:
+                json.dump(obj, f, ensure_ascii=False, separators=(",", ":"))
+
+
+# -----------------------------
+# Low-level helpers
+# -----------------------------
+
+MONEY_RE = re.compile(r'^\$?\d{1,3}(?:,\d{3})*(?:\.\d+)?$')
+SPIN_RE = re.compile(r'^\d{1,3}(?:\.\d+)?$')
+
+# Advancement / bonus patterns, compiled once instead of per-contestant
+_THROUGH_RE = re.compile(r"through\s+to\s+the\s+show", re.IGNORECASE)
+_GOES_SHOWCASE_RE = re.compile(r"goes\s+to\s+(the\s+)?showcase", re.IGNORECASE)
+_BONUS_RE = re.compile(r"Bonus", re.IGNORECASE)
+_BONUS_VAL_RE = re.compile(r"Bonus(?:\s+Spin)?\s+(\d{1,3}(?:\.\d+)?)", re.IGNORECASE)
+_BONUS_CASH_RE = re.compile(r"\$ ?(10,?000|25,?000|5,?000)")
+
+KEYWORDS = {
+    "Through", "to", "the", "Showcases", "Showcase", "Round", "Goes",
+    "BONUS", "Bonus", "SPIN", "Spin", "bonus", "ROUND",
+    "showcases", "showcase"
+}
+
+BAD_NAME_TOKENS = {
+    "OVER", "STAYS", "THROUGH", "THROUG", "THROPHUGH", "THROPUGH",
+    "THRU", "THO"
+}
+
+_AND_SET = frozenset({"And", "&", "AND"})
+
+
+# Interned record keys: every contestant/spin dict built below shares these
+# exact string objects, so dict construction and JSON key serialization
+# never re-hash fresh copies (guaranteed even off-CPython, where literal
+# interning isn't promised)
+_K_NAME = sys.intern("name")
+_K_PRE = sys.intern("pre_wheel_winnings")
+_K_PRE_RAW = sys.intern("pre_wheel_winnings_raw")
+_K_INITIAL = sys.intern("initial_spins")
+_K_TOTAL = sys.intern("total")
+_K_BUST = sys.intern("bust")
+_K_SPIN_OFF = sys.intern("spin_off_spins")
+_K_BONUS = sys.intern("bonus_spins")
+_K_ADVANCED = sys.intern("advanced_to_showcase")
+_K_NOTES = sys.intern("notes")
+_K_SPIN_INDEX = sys.intern("spin_index")
+_K_VALUE = sys.intern("value")
+_K_RAW = sys.intern("raw")
+_K_ROUND = sys.intern("round")
+
+
+# Single-char rewrites for tokenize, applied in one translate pass
+_TRANS = str.maketrans({"\xa0": " ", "►": " ", ">": " ", "=": " "})
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalize and split showdown text into tokens."""
+    if not text:
+        return []
+    # split() with no argument collapses runs of whitespace, so the old
+    # re.sub(r"\s+", " ") pass is unnecessary
+    return text.translate(_TRANS).split()
+
+
+# First characters that can start a money/spin token; filters out the
+# ~90% of tokens (names, keywords) before they reach the regex engine.
+_MONEY_FIRST = frozenset('$0123456789')
+_SPIN_FIRST = frozenset('0123456789')
+
+
+def is_money_token(tok: str) -> bool:
+    if tok[:1] not in _MONEY_FIRST:
+        return False
+    return bool(MONEY_RE.match(tok))
+
+
+def parse_money(tok: str):
+    tok = tok.replace("$", "").replace(",", "")
+    try:
+        return int(tok)
+    except ValueError:
+        try:
+            return float(tok)
+        except ValueError:
+            return None
+
+
+def parse_spin(tok: str):
+    if tok[:1] not in _SPIN_FIRST:
+        return None
+    # Plain small integers ("5".."100") skip the regex entirely
+    if len(tok) <= 3 and tok.isdigit():
+        return float(tok)
+    if not SPIN_RE.match(tok):
+        return None
+    try:
+        return float(tok)
+    except ValueError:
+        return None
+
+
+def is_spin_value(tok: str) -> bool:
+    """Recognize wheel spin values (5–100 or exactly 1.00)."""
+    # Almost all spins are plain integers; decide those without any
+    # regex or float work
+    if tok.isdigit():
+        if len(tok) > 3:
+            return False
+        n = int(tok)
+        return n == 1 or 5 <= n <= 100
+    v = parse_spin(tok)
+    if v is None:
+        return False
+    if abs(v - 1.0) < 1e-6:
+        return True
+    return 5 <= v <= 100
+
+
+def is_name_token(tok: str) -> bool:
+    """Improved heuristic to reject fake names like OVER, STAYS, THROUG."""
+    if not tok:
+        return False
+    c0 = tok[0]
+    if not (c0.isalpha() and c0.isupper()):
+        return False
+    if tok in KEYWORDS:
+        return False
+    if tok in _AND_SET:
+        return False
+    if tok.isupper():
+        # BAD_NAME_TOKENS entries are already uppercase, no .upper() needed
+        if len(tok) > 3 or tok in BAD_NAME_TOKENS:
+            return False
+    elif tok.upper() in BAD_NAME_TOKENS:
+        return False
+    return True
+
+
+# -----------------------------
+# Contestant segmentation
+# -----------------------------
+
+def segment_contestants(tokens: List[str]) -> List[Tuple[int, int]]:
+    """
+    Find ranges in tokens corresponding to contestants using [money][Name...] pattern.
+    """
+    starts = []
+    i = 0
+    while i < len(tokens):
+        if is_money_token(tokens[i]):
+            j = i + 1
+            name_tokens = []
+            while j < len(tokens) and is_name_token(tokens[j]):
+                name_tokens.append(tokens[j])
+                j += 1
+            if name_tokens:
+                starts.append(i)
+                i = j
+                continue
+        i += 1
+
+    segments = []
+    for idx, start in enumerate(starts):
+        end = starts[idx + 1] - 1 if idx + 1 < len(starts) else len(tokens) - 1
+        segments.append((start, end))
+    return segments
+
+
+def parse_contestant_segment(tokens: List[str], start: int, end: int) -> Dict[str, Any]:
+    """Parse one contestant's section of the showdown."""
+    prize_tok = tokens[start]
+    pre_wheel = parse_money(prize_tok)
+
+    # Name
+    i = start + 1
+    name_tokens = []
+    while i <= end and is_name_token(tokens[i]):
+        name_tokens.append(tokens[i])
+        i += 1
+    name = " ".join(name_tokens) if name_tokens else None
+
+    rest_tokens = tokens[i:end + 1]
+
+    # Spins
+    spin_vals, spin_raw = [], []
+    for t in rest_tokens:
+        if is_spin_value(t):
+            v = parse_spin(t)
+            if v is not None:
+                spin_vals.append(v)
+                spin_raw.append(t)
+
+    # Initial spins
+    initial_spins = []
+    for idx in range(2):
+        if idx < len(spin_vals):
+            initial_spins.append({_K_SPIN_INDEX: idx + 1, _K_VALUE: spin_vals[idx], _K_RAW: spin_raw[idx]})
+        else:
+            initial_spins.append({_K_SPIN_INDEX: idx + 1, _K_VALUE: None, _K_RAW: None})
+
+    # Extra spins
+    extra_spins = []
+    if len(spin_vals) > 2:
+        for extra_idx in range(2, len(spin_vals)):
+            extra_spins.append({
+                _K_ROUND: extra_idx - 1,
+                _K_VALUE: spin_vals[extra_idx],
+                _K_RAW: spin_raw[extra_idx]
+            })
+
+    # Total
+    vals = [s["value"] for s in initial_spins if s["value"] is not None]
+    total = sum(vals) if vals else None
+    bust = total is not None and total > 100
+
+    segment_text = " ".join(rest_tokens).strip()
+
+    # Improved advancement detection
+    advanced = False
+    if _THROUGH_RE.search(segment_text):
+        advanced = True
+    if _GOES_SHOWCASE_RE.search(segment_text):
+        advanced = True
+
+    # Bonus (cheap keyword check gates the expensive value/cash patterns)
+    bonus_spins = []
+    if _BONUS_RE.search(segment_text):
+        m_val = _BONUS_VAL_RE.search(segment_text)
+        wheel_val = float(m_val.group(1)) if m_val else None
+
+        m_cash = _BONUS_CASH_RE.search(segment_text)
+        prize = int(m_cash.group(1).replace(",", "")) if m_cash else None
+
+        if wheel_val is not None or prize is not None:
+            bonus_spins.append({
+                "spin_index": 1,
+                "wheel_value": wheel_val,
+                "cash_prize": prize,
+                "raw": segment_text,
+                "interpreted_from": "explicit" if (m_val or m_cash) else "unknown"
+            })
+
+    return {
+        _K_NAME: name,
+        _K_PRE: pre_wheel,
+        _K_PRE_RAW: prize_tok,
+        _K_INITIAL: initial_spins,
+        _K_TOTAL: total,
+        _K_BUST: bust,
+        _K_SPIN_OFF: extra_spins,
+        _K_BONUS: bonus_spins,
+        _K_ADVANCED: advanced,
+        _K_NOTES: segment_text
+    }
+
+
+# -----------------------------
+# Showdown parsing
+# -----------------------------
+
+def parse_showdown(text: str) -> Dict[str, Any]:
+    tokens = tokenize(text)
+    segments = segment_contestants(tokens)
+
+    warnings = []
+    if len(segments) < 2:
+        warnings.append("too_few_contestants")
+
+    contestants = []
+    for idx, (start, end) in enumerate(segments):
+        c = parse_contestant_segment(tokens, start, end)
+        c["position"] = idx + 1
+        contestants.append(c)
+        if c["name"] is None or c["initial_spins"][0]["value"] is None:
+            warnings.append(f"contestant_{idx+1}_missing_core_fields")
+
+    # Winner detection
+    advanced_indices = [i for i, c in enumerate(contestants) if c["advanced_to_showcase"]]
+    winner_index = None
+
+    if len(advanced_indices) == 1:
+        winner_index = advanced_indices[0]
+    elif len(advanced_indices) == 0 and contestants:
+        best_total = -1
+        best_idx = None
+        for i, c in enumerate(contestants):
+            t = c["total"]
+            if t is None or t > 100:
+                continue
+            if t > best_total:
+                best_total = t
+                best_idx = i
+        if best_idx is not None:
+            winner_index = best_idx
+            warnings.append("winner_inferred_by_total")
+        else:
+            warnings.append("no_non_bust_winner")
+    else:
+        warnings.append("multiple_advanced_flags")
+
+    winner_name = contestants[winner_index]["name"] if winner_index is not None else None
+
+    # Parse status
+    if winner_name is None or any("missing_core_fields" in w for w in warnings):
+        parse_status = "error"
+    else:
+        parse_status = "ok" if not warnings else "partial"
+
+    return {
+        "raw_text": text,
+        "contestants": contestants,
+        "winner_name": winner_name,
+        "winner_index": winner_index,
+        "parse_status": parse_status,
+        "parse_warnings": warnings
+    }
+
+
+# -----------------------------
+# Validation
+# -----------------------------
+
+# The wheel only shows 5-cent multiples plus the 1.00 space (recorded as
+# 1.0 here); one membership test replaces the range/modulo arithmetic
+VALID_SPINS = frozenset([1.0] + [float(x) for x in range(5, 101, 5)])
+
+
+def validate_showdown_struct(sd: Dict[str, Any]) -> List[str]:
+    errors = []
+    contestants = sd.get("contestants", [])
+    winner_index = sd.get("winner_index")
+    winner_name = sd.get("winner_name")
+
+    # Too few contestants
+    if len(contestants) < 2:
+        errors.append("val_too_few_contestants")
+
+    # Spin validation
+    for ci, c in enumerate(contestants):
+        spins = c.get("initial_spins", [])
+        total = c.get("total")
+        vals = []
+
+        for s in spins:
+            v = s["value"]
+            if v is None:
+                continue
+            vals.append(v)
+            if v not in VALID_SPINS:
+                errors.append(f"val_spin_out_of_range_c{ci+1}_v{v}")
+
+        recomputed = sum(vals) if vals else None
+        if total is not None and recomputed is not None:
+            if abs(total - recomputed) > 1e-6:
+                errors.append(f"val_total_mismatch_c{ci+1}_total{total}_recomputed{recomputed}")
+
+    # Winner validation
+    if winner_index is None or winner_name is None:
+        errors.append("val_no_winner")
+    else:
+        if not (0 <= winner_index < len(contestants)):
+            errors.append("val_winner_index_out_of_range")
+        else:
+            Tw = contestants[winner_index]["total"]
+            if Tw is None:
+                errors.append("val_winner_missing_total")
+            else:
+                if Tw > 100:
+                    errors.append("val_winner_bust_total")
+                for j, c in enumerate(contestants):
+                    if j == winner_index:
+                        continue
+                    T = c["total"]
+                    if T is None or T > 100:
+                        continue
+                    if Tw < T:
+                        errors.append("val_winner_not_highest_non_bust")
+                        break
+
+    # Advanced flag logic
+    adv = [i for i, c in enumerate(contestants) if c["advanced_to_showcase"]]
+    if len(adv) > 1:
+        errors.append("val_multiple_advanced_flags")
+    elif len(adv) == 1 and winner_index is not None:
+        if adv[0] != winner_index:
+            errors.append("val_advanced_not_winner")
+
+    return errors
+
+
+# -----------------------------
+# Keep/Reject rules
+# -----------------------------
+
+STRUCTURAL_WARNINGS = {
+    "too_few_contestants",
+    "no_non_bust_winner",
+    "multiple_advanced_flags"
+}
+
+
+def is_structural_warning(w: str) -> bool:
+    return (
+        w in STRUCTURAL_WARNINGS or
+        "missing_core_fields" in w
+    )
+
+
+# -----------------------------
+# Scenario classification
+# -----------------------------
+
+def classify_scenario(parsed: Dict[str, Any]):
+    """
+    Classify a parsed showdown for the simulation datasets:
+        1 - no busts, no spin-offs, no bonus
+        2 - >=1 bust, no spin-offs, no bonus
+        3 - >=1 spin-off, no bonus
+    Returns None for anything else (wrong contestant count, bonus spins,
+    missing first spins).
+    """
+    contestants = parsed["contestants"]
+
+    # Must be exactly 3 contestants
+    if len(contestants) != 3:
+        return None
+
+    # No bonus spins allowed in any tracked scenario
+    if any(c["bonus_spins"] for c in contestants):
+        return None
+
+    # All must have a first spin
+    for c in contestants:
+        if c["initial_spins"][0]["value"] is None:
+            return None
+
+    # Scenario 3: has a spin-off, no bonus
+    if any(c["spin_off_spins"] for c in contestants):
+        return 3
+
+    # Scenario 1/2: no spinoff, no bonus
+    busts = sum(c["bust"] for c in contestants)
+    return 2 if busts >= 1 else 1